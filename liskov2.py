@@ -1,24 +1,72 @@
+import array
 import ast
+import codecs
+import io
 import os
-from typing import Dict
+import shutil
+import sys
+import tokenize
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, NamedTuple
 import json
-import astor  # For converting AST back to source code
+
+class ClassRecord(NamedTuple):
+    """Everything InheritanceGraph.add_class needs to know about one parsed class."""
+    class_name: str
+    parent_names: list[str]
+    source_code: str
+    module_path: str
 
 class InheritanceGraph:
     """
     Manages class inheritance relationships and stores class source code.
+
+    Classes are stored as parallel lists indexed by an integer class id. Every
+    name seen in the codebase gets an id, including base classes that are only
+    referenced and never defined there; names are only materialized again when
+    results are handed out.
     """
     def __init__(self):
-        # Maps class names to their direct parent classes
-        self.direct_parents = {}
-        # Maps class names to their source code
-        self.class_source = {}
-        # Add a new dictionary to store module paths for each class
-        self.class_modules = {}
-        # Add a dictionary to store full module content
-        self.module_contents = {}
+        # Maps class names to their ids, and ids back to names
+        self.index: dict[str, int] = {}
+        self.names: list[str] = []
+        # Direct parent class ids of each class
+        self.parents_of: list[set[int]] = []
+        # Source code of each class ("" for classes not defined in the codebase)
+        self.source_of: list[str] = []
+        # Module id of each class (-1 for classes not defined in the codebase)
+        self.module_of: list[int] = []
+        # Position of each class in definition order (-1 for classes not defined in
+        # the codebase), and the defined class ids in that order. Ids are handed out
+        # on first reference, so output is ordered by these instead.
+        self.definition_order: list[int] = []
+        self.defined_ids: list[int] = []
+        # Module paths by module id, and the reverse mapping
+        self.modules: list[str] = []
+        self.module_index: dict[str, int] = {}
+        # Transitive ancestor ids indexed by class id, rebuilt lazily after add_class
+        self._ancestors: list[set[int]] | None = None
+        # Preorder (Schubert) numbering of the single-inheritance spanning forest,
+        # also rebuilt lazily; see _build_intervals
+        self._preorder: array.array | None = None
+        self._subtree_end = array.array('i')
+        self._exact_limit = 0
+
+    def _intern_class(self, class_name: str) -> int:
+        """Return the id of a class name, allocating a new one if needed."""
+        class_name = sys.intern(class_name)
+        class_id = self.index.setdefault(class_name, len(self.names))
+        if class_id == len(self.names):
+            self.names.append(class_name)
+            self.parents_of.append(set())
+            self.source_of.append("")
+            self.module_of.append(-1)
+            self.definition_order.append(-1)
+        return class_id
 
-    def add_class(self, class_name: str, parent_names: list[str], source_code: str, module_path: str, module_content: str) -> None:
+    def add_class(self, class_name: str, parent_names: list[str], source_code: str, module_path: str) -> None:
         """
         Add a class and its direct parent classes to the graph.
         
@@ -27,70 +75,276 @@ class InheritanceGraph:
             parent_names: List of direct parent class names
             source_code: Raw source code of the class
             module_path: Path to the module containing the class
-            module_content: Full content of the module
         """
-        self.direct_parents[class_name] = set(parent_names)
-        self.class_source[class_name] = source_code
-        self.class_modules[class_name] = module_path
-        self.module_contents[module_path] = module_content
+        class_id = self._intern_class(class_name)
+        if self.definition_order[class_id] < 0:
+            self.definition_order[class_id] = len(self.defined_ids)
+            self.defined_ids.append(class_id)
+        self.parents_of[class_id] = {self._intern_class(parent) for parent in parent_names}
+        self.source_of[class_id] = source_code
+        module_path = sys.intern(module_path)
+        module_id = self.module_index.setdefault(module_path, len(self.modules))
+        if module_id == len(self.modules):
+            self.modules.append(module_path)
+        self.module_of[class_id] = module_id
+        self._ancestors = None
+        self._preorder = None
+
+    def _build_ancestors(self) -> None:
+        """
+        Compute the transitive ancestors of every class in a single pass.
+
+        Classes are processed in topological order (Kahn's algorithm), so each
+        class's ancestor set is the union of its parents' sets and every
+        inheritance edge is visited once. Classes on or below an inheritance
+        cycle never become ready and fall back to an iterative traversal.
+        """
+        parents_of = self.parents_of
+        children: list[list[int]] = [[] for _ in parents_of]
+        pending = [len(parents) for parents in parents_of]
+        for class_id, parents in enumerate(parents_of):
+            for parent in parents:
+                children[parent].append(class_id)
+
+        ancestors_of: list[set[int] | None] = [None] * len(parents_of)
+        ready = [class_id for class_id, count in enumerate(pending) if count == 0]
+        while ready:
+            class_id = ready.pop()
+            ancestors = set()
+            for parent in parents_of[class_id]:
+                ancestors.add(parent)
+                ancestors |= ancestors_of[parent]
+            ancestors_of[class_id] = ancestors
+            for child in children[class_id]:
+                pending[child] -= 1
+                if pending[child] == 0:
+                    ready.append(child)
+
+        for class_id, ancestors in enumerate(ancestors_of):
+            if ancestors is not None:
+                continue
+            ancestors = set()
+            stack = [class_id]
+            while stack:
+                current = stack.pop()
+                for parent in parents_of[current]:
+                    if parent not in ancestors:
+                        ancestors.add(parent)
+                        stack.append(parent)
+            ancestors_of[class_id] = ancestors
+
+        self._ancestors = ancestors_of
+
+    def _ancestors_of(self, class_id: int) -> set[int]:
+        """Return the transitive ancestors of a class, building the cache if needed."""
+        if self._ancestors is None:
+            self._build_ancestors()
+        return self._ancestors[class_id]
+
+    def _build_intervals(self) -> None:
+        """
+        Number the inheritance forest so that subclass tests become interval checks.
+
+        Every class with exactly one parent hangs under that parent; classes with no
+        parents or with several parents become roots. Classes are numbered in DFS
+        preorder, so the descendants of the class at position p occupy the positions
+        [p, subtree_end[p]]. Trees rooted at a class without parents are numbered
+        first: for any class positioned below _exact_limit the whole ancestry lies
+        on its tree path and the interval check is exact. Classes on an inheritance
+        cycle are never reached and keep position -1.
+        """
+        children: list[list[int]] = [[] for _ in self.names]
+        exact_roots = []
+        inexact_roots = []
+        for class_id, parents in enumerate(self.parents_of):
+            if len(parents) == 1:
+                (parent,) = parents
+                children[parent].append(class_id)
+            elif parents:
+                inexact_roots.append(class_id)
+            else:
+                exact_roots.append(class_id)
+
+        preorder = array.array('i', [-1]) * len(self.names)
+        parent_positions = []
+        for roots in (exact_roots, inexact_roots):
+            for root in roots:
+                stack = [(root, -1)]
+                while stack:
+                    class_id, parent_position = stack.pop()
+                    position = len(parent_positions)
+                    preorder[class_id] = position
+                    parent_positions.append(parent_position)
+                    stack.extend((child, position) for child in children[class_id])
+            if roots is exact_roots:
+                self._exact_limit = len(parent_positions)
+
+        # Children are numbered after their parents, so a reverse sweep finalises
+        # each subtree before extending the parent's range with it.
+        subtree_end = array.array('i', range(len(parent_positions)))
+        for position in range(len(parent_positions) - 1, -1, -1):
+            parent_position = parent_positions[position]
+            if parent_position >= 0 and subtree_end[position] > subtree_end[parent_position]:
+                subtree_end[parent_position] = subtree_end[position]
+
+        self._preorder = preorder
+        self._subtree_end = subtree_end
 
     def is_subclass(self, potential_child: str, potential_parent: str) -> bool:
         """
-        Check if one class is a subclass of another by recursively traversing the inheritance graph.
+        Check if one class is a subclass of another.
+
+        Single-inheritance chains are answered from the preorder intervals; other
+        classes fall back to the cached ancestor sets.
         """
         if potential_child == potential_parent:
             return True
-        if potential_child not in self.direct_parents:
+        child_id = self.index.get(potential_child)
+        parent_id = self.index.get(potential_parent)
+        if child_id is None or parent_id is None or self.module_of[child_id] < 0:
             return False
-        direct_parents = self.direct_parents[potential_child]
-        if potential_parent in direct_parents:
-            return True
-        return any(self.is_subclass(parent, potential_parent) 
-                  for parent in direct_parents)
+        if self._preorder is None:
+            self._build_intervals()
+        child_position = self._preorder[child_id]
+        if 0 <= child_position < self._exact_limit:
+            parent_position = self._preorder[parent_id]
+            return 0 <= parent_position <= child_position <= self._subtree_end[parent_position]
+        return parent_id in self._ancestors_of(child_id)
+
+    def _iter_pair_ids(self) -> Iterator[tuple[int, int]]:
+        """
+        Yield (superclass id, subclass id) for every subclass-superclass pair.
+
+        Pairs are enumerated directly from the cached ancestor sets; only ancestors
+        defined in the graph are reported. Both subclasses and their ancestors
+        follow the order in which the classes were defined.
+        """
+        definition_order = self.definition_order
+        for child in self.defined_ids:
+            ancestors = sorted(
+                (
+                    ancestor for ancestor in self._ancestors_of(child)
+                    if definition_order[ancestor] >= 0 and ancestor != child
+                ),
+                key=definition_order.__getitem__,
+            )
+            for ancestor in ancestors:
+                yield ancestor, child
 
     def get_all_pairs(self) -> list[tuple[str, str]]:
         """
         Find all subclass-superclass pairs in the inheritance graph.
         """
-        pairs = []
-        for child in self.direct_parents:
-            for potential_parent in self.direct_parents:
-                if child != potential_parent and self.is_subclass(child, potential_parent):
-                    pairs.append((potential_parent, child))
-        return pairs
+        names = self.names
+        return [(names[superclass], names[subclass]) for superclass, subclass in self._iter_pair_ids()]
 
-class ClassInfoExtractor(ast.NodeVisitor):
-    def __init__(self):
-        super().__init__()
-        self.inheritance_graph = InheritanceGraph()
-        self.current_module_content = ""
-        self.current_module_path = ""
+    def get_pairs_by_module(self) -> dict[tuple[str, str], list[tuple[str, str]]]:
+        """
+        Group all subclass-superclass pairs by their (superclass module, subclass module).
+
+        Pairs are grouped as they are enumerated, without building the full pair list.
+        """
+        names = self.names
+        module_of = self.module_of
+        groups: dict[tuple[int, int], list[tuple[str, str]]] = defaultdict(list)
+        for superclass, subclass in self._iter_pair_ids():
+            groups[module_of[superclass], module_of[subclass]].append((names[superclass], names[subclass]))
+        return {
+            (self.modules[super_module], self.modules[sub_module]): pairs
+            for (super_module, sub_module), pairs in groups.items()
+        }
+
+    def get_classes_by_module(self) -> dict[str, list[str]]:
+        """Map each module path to the sorted names of the classes defined in it."""
+        classes_by_module: list[list[str]] = [[] for _ in self.modules]
+        for class_id, module_id in enumerate(self.module_of):
+            if module_id >= 0:
+                classes_by_module[module_id].append(self.names[class_id])
+        for classes in classes_by_module:
+            classes.sort()
+        return dict(zip(self.modules, classes_by_module))
 
-    def visit_ClassDef(self, node: ast.ClassDef):
+class ClassInfoExtractor:
+    # Statement fields that can contain nested statements, and so class definitions.
+    # Expression subtrees never define classes and are not visited at all. The
+    # order follows ast.Try._fields, so classes are recorded in source order.
+    BODY_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+    def __init__(self, source: bytes, path: str, line_starts: list[int], keep_class_source: bool = False):
+        """
+        Args:
+            source: Raw content of the module being extracted
+            path: Path to the module
+            line_starts: Byte offset of each line of source; AST column offsets
+                are byte offsets, so class sources are sliced using these
+            keep_class_source: Whether to record each class's own source code;
+                the output only uses full module contents, so this is off by default
+        """
+        self.source = source
+        self.path = path
+        self.line_starts = line_starts
+        self.keep_class_source = keep_class_source
+        self.records: list[ClassRecord] = []
+
+    def extract(self, tree: ast.Module) -> None:
+        """
+        Record every class in the module with an iterative walk over statement bodies.
+
+        The stack carries the dotted name of the enclosing class, so nested classes
+        are named e.g. 'Outer.Inner'; a function scope resets the prefix. It also
+        carries the classes defined so far in the enclosing class body, so that
+        bases naming an earlier sibling resolve to that nested class.
+        """
+        stack = [(tree, "", set())]
+        while stack:
+            node, prefix, scope_classes = stack.pop()
+            if isinstance(node, ast.ClassDef):
+                full_class_name = prefix + node.name
+                self._emit(node, full_class_name, prefix, scope_classes)
+                scope_classes.add(node.name)
+                prefix = full_class_name + "."
+                scope_classes = set()
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                prefix = ""
+                scope_classes = set()
+            children = []
+            for field in self.BODY_FIELDS:
+                children.extend(getattr(node, field, ()))
+            # Push in reverse so that classes are recorded in source order
+            stack.extend((child, prefix, scope_classes) for child in reversed(children))
+
+    def _emit(self, node: ast.ClassDef, full_class_name: str, prefix: str, scope_classes: set[str]) -> None:
         """Extract class name, bases, and source code."""
         base_names = []
 
         # Extract direct base classes
         for base in node.bases:
             if isinstance(base, ast.Name):
-                base_names.append(base.id)
+                base_name = base.id
             elif isinstance(base, ast.Attribute):
-                base_names.append(self._get_full_attr_name(base))
+                base_name = self._get_full_attr_name(base)
+            else:
+                continue
+            # Inside a class body, a class defined earlier in the same body shadows
+            # any module-level class of that name
+            if base_name.partition(".")[0] in scope_classes:
+                base_name = prefix + base_name
+            base_names.append(sys.intern(base_name))
 
-        # Get the source code for the class
-        source_code = astor.to_source(node)
+        # Get the original source code of the class straight from the module text
+        source_code = ""
+        if self.keep_class_source:
+            start = self.line_starts[node.lineno - 1] + node.col_offset
+            end = self.line_starts[node.end_lineno - 1] + node.end_col_offset
+            source_code = self.source[start:end].decode("utf-8", "replace")
         
-        # Add to inheritance graph
-        full_class_name = self._get_full_class_name(node)
-        self.inheritance_graph.add_class(
+        # Record the class; the records are merged into the inheritance graph later
+        self.records.append(ClassRecord(
             full_class_name, 
             base_names, 
             source_code,
-            self.current_module_path,
-            self.current_module_content
-        )
-
-        self.generic_visit(node)
+            self.path
+        ))
 
     def _get_full_attr_name(self, node: ast.Attribute) -> str:
         """Return a dotted name for an Attribute node (e.g., 'module.Class')."""
@@ -101,130 +355,184 @@ class ClassInfoExtractor(ast.NodeVisitor):
         else:
             return node.attr
 
-    def _get_full_class_name(self, node: ast.ClassDef) -> str:
-        """Construct the full dotted name for a class."""
-        full_name = node.name
-        current = node
-        while hasattr(current, 'parent') and isinstance(current.parent, ast.ClassDef):
-            full_name = f"{current.parent.name}.{full_name}"
-            current = current.parent
-        return full_name
-
-def process_file(file_path: str, extractor: ClassInfoExtractor) -> None:
-    """Process a single Python file to extract class information."""
+def compute_line_starts(data: bytes) -> list[int]:
+    """Return the byte offset at which each line of data starts."""
+    line_starts = [0]
+    newline = data.find(b"\n")
+    while newline != -1:
+        line_starts.append(newline + 1)
+        newline = data.find(b"\n", newline + 1)
+    return line_starts
+
+def to_utf8_source(data: bytes) -> bytes:
+    """
+    Return a module's source as the UTF-8 text its AST offsets refer to.
+
+    ast.parse honours a BOM and coding cookies and reports column offsets in the
+    decoded text encoded as UTF-8. Plain UTF-8 sources are returned unchanged.
+    """
+    encoding, _ = tokenize.detect_encoding(io.BytesIO(data).readline)
+    if encoding == "utf-8":
+        return data
+    if encoding == "utf-8-sig":
+        return data[len(codecs.BOM_UTF8):]
+    return data.decode(encoding).encode("utf-8")
+
+def parse_file(file_path: str, keep_class_source: bool = False) -> list[ClassRecord]:
+    """
+    Parse a single Python file and return records for the classes it defines.
+
+    This runs in worker processes, so it uses a fresh extractor and shares no state.
+    Class source code is only recorded if keep_class_source is set.
+    """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            source = f.read()
-        tree = ast.parse(source, file_path)
-        # Store the full module content in the extractor
-        extractor.current_module_content = source
-        extractor.current_module_path = file_path
-        extractor.visit(tree)
+        # ast.parse accepts bytes; only sources that are not plain UTF-8 get decoded
+        with open(file_path, "rb") as f:
+            data = f.read()
+        tree = ast.parse(data, file_path)
+        source = to_utf8_source(data)
+        line_starts = compute_line_starts(source) if keep_class_source else []
+        extractor = ClassInfoExtractor(source, file_path, line_starts, keep_class_source)
+        extractor.extract(tree)
+        return extractor.records
     except Exception as e:
         print(f"Error processing {file_path}: {str(e)}")
+        return []
+
+def iter_python_files(root_dir: str) -> Iterator[str]:
+    """
+    Yield the paths of all .py files under root_dir, without following symlinks.
 
-def process_codebase(root_dir: str, extractor: ClassInfoExtractor) -> InheritanceGraph:
+    Files come in the same top-down order as os.walk: a directory's own files first,
+    then its subdirectories depth-first. Unreadable directories are skipped.
     """
-    Walk through the codebase and process all Python files.
+    stack = [root_dir]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith('.py'):
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+def process_codebase(root_dir: str, keep_class_source: bool = False) -> InheritanceGraph:
+    """
+    Walk through the codebase, parse all Python files in parallel and merge the
+    results into a single inheritance graph.
     """
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            if filename.endswith('.py'):
-                file_path = os.path.join(dirpath, filename)
-                process_file(file_path, extractor)
+    inheritance_graph = InheritanceGraph()
+    parse = partial(parse_file, keep_class_source=keep_class_source)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for records in executor.map(parse, iter_python_files(root_dir), chunksize=16):
+            for record in records:
+                inheritance_graph.add_class(*record)
     
-    return extractor.inheritance_graph
+    return inheritance_graph
 
 def write_class_pairs(inheritance_graph: InheritanceGraph, output_dir: str) -> None:
     """Write subclass-superclass pairs to files with complete module contents."""
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+    # Sorted class names per module, computed once for all output files
+    classes_by_module = inheritance_graph.get_classes_by_module()
 
-    def get_classes_in_module(module_path: str, as_super: bool, pairs: list[tuple[str, str]]) -> list[str]:
-        """Get classes defined in a module, filtered by their role in the inheritance pairs."""
-        classes = set()
-        for superclass, subclass in pairs:
-            if inheritance_graph.class_modules[superclass] == module_path and as_super:
-                classes.add(superclass)
-            elif inheritance_graph.class_modules[subclass] == module_path and not as_super:
-                classes.add(subclass)
-        return sorted(classes)
+    def get_classes_in_module(module_path: str, role_classes: set[str]) -> list[str]:
+        """Get classes defined in a module that play the given role in the inheritance pairs."""
+        return [class_name for class_name in classes_by_module[module_path] if class_name in role_classes]
 
-    def get_other_classes_in_module(module_path: str, pairs: list[tuple[str, str]]) -> list[str]:
+    def get_other_classes_in_module(module_path: str, involved_classes: set[str]) -> list[str]:
         """Get classes defined in a module that aren't involved in these inheritance relationships."""
-        involved_classes = set()
-        for superclass, subclass in pairs:
-            involved_classes.add(superclass)
-            involved_classes.add(subclass)
-        
-        return sorted([
-            class_name for class_name, path in inheritance_graph.class_modules.items()
-            if path == module_path and class_name not in involved_classes
-        ])
+        return [
+            class_name for class_name in classes_by_module[module_path]
+            if class_name not in involved_classes
+        ]
 
     # Group pairs by their module combinations
-    module_groups = {}
-    for pair in inheritance_graph.get_all_pairs():
-        superclass, subclass = pair
-        super_module = inheritance_graph.class_modules[superclass]
-        sub_module = inheritance_graph.class_modules[subclass]
-        
-        module_key = (super_module, sub_module)
-        if module_key not in module_groups:
-            module_groups[module_key] = []
-        module_groups[module_key].append((superclass, subclass))
+    module_groups = inheritance_graph.get_pairs_by_module()
     
-    # Write one file per unique module combination
-    for (super_module, sub_module), pairs in module_groups.items():
-        first_pair = pairs[0]
-        output_path = os.path.join(output_dir, f"{first_pair[0]}.{first_pair[1]}.txt")
+    def write_module_group(job: tuple[str, tuple[str, str], list[tuple[str, str]]]) -> None:
+        """Write the output file for one (superclass module, subclass module) combination."""
+        output_path, (super_module, sub_module), pairs = job
+        # Resolve each class's role in these pairs once for all sections below
+        superclasses = {superclass for superclass, _ in pairs}
+        subclasses = {subclass for _, subclass in pairs}
+        involved_classes = superclasses | subclasses
+        # Collect the header sections and write them with a single call
+        parts = []
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Write header with inheritance relationships
-            f.write("# Inheritance relationships in this file:\n")
-            for superclass, subclass in pairs:
-                f.write(f"# - {superclass} -> {subclass}\n")
-            f.write("\n")
-            
-            # List classes in first module
-            f.write(f"# Classes in {super_module}:\n")
-            f.write("# Superclasses:\n")
-            for class_name in get_classes_in_module(super_module, True, pairs):
-                f.write(f"# - {class_name}\n")
-            if super_module == sub_module:
-                f.write("# Subclasses:\n")
-                for class_name in get_classes_in_module(super_module, False, pairs):
-                    f.write(f"# - {class_name}\n")
-            f.write("# Other classes:\n")
-            for class_name in get_other_classes_in_module(super_module, pairs):
-                f.write(f"# - {class_name}\n")
-            f.write("\n")
-            
-            if super_module != sub_module:
-                f.write(f"# Classes in {sub_module}:\n")
-                f.write("# Subclasses:\n")
-                for class_name in get_classes_in_module(sub_module, False, pairs):
-                    f.write(f"# - {class_name}\n")
-                f.write("# Other classes:\n")
-                for class_name in get_other_classes_in_module(sub_module, pairs):
-                    f.write(f"# - {class_name}\n")
-                f.write("\n")
-            
-            # Write module contents
-            f.write(f"# Full contents of {super_module}:\n")
-            f.write(inheritance_graph.module_contents[super_module])
+        # Write header with inheritance relationships
+        parts.append("# Inheritance relationships in this file:\n")
+        for superclass, subclass in pairs:
+            parts.append(f"# - {superclass} -> {subclass}\n")
+        parts.append("\n")
+        
+        # List classes in first module
+        parts.append(f"# Classes in {super_module}:\n")
+        parts.append("# Superclasses:\n")
+        for class_name in get_classes_in_module(super_module, superclasses):
+            parts.append(f"# - {class_name}\n")
+        if super_module == sub_module:
+            parts.append("# Subclasses:\n")
+            for class_name in get_classes_in_module(super_module, subclasses):
+                parts.append(f"# - {class_name}\n")
+        parts.append("# Other classes:\n")
+        for class_name in get_other_classes_in_module(super_module, involved_classes):
+            parts.append(f"# - {class_name}\n")
+        parts.append("\n")
+        
+        if super_module != sub_module:
+            parts.append(f"# Classes in {sub_module}:\n")
+            parts.append("# Subclasses:\n")
+            for class_name in get_classes_in_module(sub_module, subclasses):
+                parts.append(f"# - {class_name}\n")
+            parts.append("# Other classes:\n")
+            for class_name in get_other_classes_in_module(sub_module, involved_classes):
+                parts.append(f"# - {class_name}\n")
+            parts.append("\n")
+        
+        # Write module contents, streamed from the source files rather than kept in memory
+        parts.append(f"# Full contents of {super_module}:\n")
+        with open(output_path, 'wb') as f:
+            f.write("".join(parts).encode("utf-8"))
+            with open(super_module, 'rb') as module_file:
+                shutil.copyfileobj(module_file, f)
             
-            f.write("\n\n" + "="*80 + "\n\n")
+            f.write(("\n\n" + "="*80 + "\n\n").encode("utf-8"))
             
             if super_module != sub_module:
-                f.write(f"# Full contents of {sub_module}:\n")
-                f.write(inheritance_graph.module_contents[sub_module])
+                f.write(f"# Full contents of {sub_module}:\n".encode("utf-8"))
+                with open(sub_module, 'rb') as module_file:
+                    shutil.copyfileobj(module_file, f)
+
+    # Name each file after its first pair. Dotted names can collide, e.g. the pairs
+    # ("A.B", "C") and ("A", "B.C"), so later groups get a numeric suffix and no
+    # two threads ever write the same file.
+    jobs = []
+    file_names = set()
+    for module_key, pairs in module_groups.items():
+        superclass, subclass = pairs[0]
+        file_name = f"{superclass}.{subclass}.txt"
+        suffix = 2
+        while file_name in file_names:
+            file_name = f"{superclass}.{subclass}.{suffix}.txt"
+            suffix += 1
+        file_names.add(file_name)
+        jobs.append((os.path.join(output_dir, file_name), module_key, pairs))
+
+    # Write one file per unique module combination; writing is I/O bound, so
+    # the files are written from a pool of threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write_module_group, jobs))
 
 if __name__ == "__main__":
     path = "/home/zby/llm/pydantic-ai/pydantic_ai_slim/"
-    extractor = ClassInfoExtractor()
-    inheritance_graph = process_codebase(path, extractor)
+    inheritance_graph = process_codebase(path)
     
-    # Now we have the full source code of each class in inheritance_graph.class_source
-    # and the inheritance relationships in inheritance_graph.direct_parents
+    # Now we have the inheritance relationships in inheritance_graph.parents_of;
+    # class sources are skipped since only full module contents are written out
     write_class_pairs(inheritance_graph, "class_pairs")
\ No newline at end of file
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+
+from liskov2 import process_codebase
+
+
+class NestedClassTest(unittest.TestCase):
+    def _pairs(self, source: str) -> list[tuple[str, str]]:
+        with tempfile.TemporaryDirectory() as root_dir:
+            with open(os.path.join(root_dir, "module.py"), "w", encoding="utf-8") as f:
+                f.write(source)
+            return process_codebase(root_dir).get_all_pairs()
+
+    def test_sibling_nested_inheritance(self):
+        source = (
+            "class Outer:\n"
+            "    class A:\n"
+            "        pass\n"
+            "    class B(A):\n"
+            "        pass\n"
+        )
+        self.assertEqual(self._pairs(source), [("Outer.A", "Outer.B")])
+
+    def test_sibling_shadows_module_level_class(self):
+        source = (
+            "class Foo:\n"
+            "    pass\n"
+            "class Test:\n"
+            "    class Foo:\n"
+            "        pass\n"
+            "    class Bar(Foo):\n"
+            "        pass\n"
+            "class Baz(Foo):\n"
+            "    pass\n"
+        )
+        self.assertEqual(self._pairs(source), [("Test.Foo", "Test.Bar"), ("Foo", "Baz")])
+
+
+if __name__ == "__main__":
+    unittest.main()